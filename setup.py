@@ -12,8 +12,10 @@ setup(
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
     install_requires=[
-        'pydantic>=2.6.0',
-        'requests>=2.31.0',
+        'msgspec>=0.18.0',
+        'httpx[http2]>=0.25.0',
+        'orjson>=3.9.0',
+        'selectolax>=0.3.21',
         'playwright>=1.41.0',
         'groq>=0.3.0',
         'python-dotenv>=1.0.0',
@@ -52,18 +52,18 @@ async def async_main(args):
             start_url=args.start_url,
             max_pages=args.max_pages,
             depth_limit=args.depth_limit,
+            concurrency=args.concurrency,
             extraction_strategy=args.extraction_strategy,
-            extractor=extractor
-        )
-        
-        # Run crawler
-        await crawler.crawl()
-        
-        # Save crawled data
-        crawler.save_crawled_data(
+            extractor=extractor,
             output_file=args.output_file,
             output_dir=args.output_dir
         )
+        
+        # Run crawler, streaming records to the output file
+        try:
+            await crawler.crawl()
+        finally:
+            await extractor.aclose()
     
     except Exception as e:
         logger.error(f"Crawling failed: {e}")
@@ -94,6 +94,12 @@ def main():
         default=3, 
         help='Maximum crawl depth'
     )
+    parser.add_argument(
+        '--concurrency', 
+        type=int, 
+        default=8, 
+        help='Number of pages fetched in parallel'
+    )
     
     # Extraction strategy
     parser.add_argument(
@@ -121,8 +127,8 @@ def main():
     parser.add_argument(
         '--output-file', 
         type=str, 
-        default='crawled_data.json', 
-        help='Output file for crawled data'
+        default='crawled_data.jsonl', 
+        help='Output NDJSON file for crawled data'
     )
     parser.add_argument(
         '--output-dir', 
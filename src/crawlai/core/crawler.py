@@ -1,15 +1,46 @@
 import os
 import json
+import hashlib
 import logging
 import asyncio
+import itertools
+from functools import lru_cache
 from typing import List, Dict, Optional, Union
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urldefrag, urljoin, urlparse
 
 from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
 from ..extractors.base_extractor import BaseExtractor
 from ..extractors.llm_extractor import LLMExtractor
 
+@lru_cache(maxsize=10000)
+def _cached_urlparse(url: str):
+    """Memoized urlparse for links seen on many pages"""
+    return urlparse(url)
+
+# Subresources that never contribute to page content or links
+BLOCKED_RESOURCE_TYPES = frozenset({
+    'image', 'media', 'font', 'stylesheet',
+    'texttrack', 'manifest', 'websocket', 'other'
+})
+
+# Ad and analytics hosts, blocked along with their subdomains
+BLOCKED_HOSTS = frozenset({
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'doubleclick.net',
+    'facebook.net',
+    'hotjar.com',
+    'segment.io',
+    'mixpanel.com',
+    'newrelic.com',
+    'nr-data.net',
+})
+BLOCKED_HOST_SUFFIXES = tuple('.' + host for host in BLOCKED_HOSTS)
+
 class WebCrawler:
     """
     Advanced async web crawler with flexible extraction strategies
@@ -23,7 +54,12 @@ class WebCrawler:
         allowed_domains: Optional[List[str]] = None,
         depth_limit: int = 3,
         timeout: int = 30,
-        user_agent: str = 'CrawlAI/0.1.0'
+        user_agent: str = 'CrawlAI/0.1.0',
+        concurrency: int = 8,
+        network_idle_timeout: float = 2,
+        block_resources: bool = True,
+        output_file: Optional[str] = None,
+        output_dir: Optional[str] = None
     ):
         """
         Initialize web crawler
@@ -37,26 +73,47 @@ class WebCrawler:
             depth_limit (int): Maximum crawl depth
             timeout (int): Request timeout
             user_agent (str): User agent for requests
+            concurrency (int): Number of pages fetched in parallel
+            network_idle_timeout (float): Maximum seconds to wait for network idle
+            block_resources (bool): Skip loading assets, ads and analytics
+            output_file (str, optional): NDJSON file to stream records to while crawling
+            output_dir (str, optional): Directory to save output file
         """
         self.logger = logging.getLogger(__name__)
         
-        self.start_url = start_url
+        self.start_url = urldefrag(start_url)[0]  # Fragments never change the fetched page
         self.max_pages = max_pages
         self.extraction_strategy = extraction_strategy
         self.depth_limit = depth_limit
         self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+        self.network_idle_timeout = network_idle_timeout
+        self.block_resources = block_resources
+        self.output_path = (
+            self._resolve_output_path(output_file, output_dir)
+            if output_file else None
+        )
         
-        # Set allowed domains
+        # Set allowed domains, matched case-insensitively against hostnames
         self.allowed_domains = allowed_domains or [
-            urlparse(start_url).netloc
+            urlparse(start_url).hostname
         ]
+        self._allowed_set = frozenset(domain.lower() for domain in self.allowed_domains)
+        self._allowed_suffixes = tuple('.' + domain for domain in self._allowed_set)
         
-        # Set up extractor
+        # Set up extractor; one created here is closed when crawl() ends
+        self._owns_extractor = extractor is None
         self.extractor = extractor or LLMExtractor()
         
         # Tracking
         self.crawled_urls = set()
         self.crawled_data = []
+        self._seen = {self.start_url}  # Queued or crawled URLs
+        self._content_hashes = {}  # Page text digest -> extracted content
+        self._in_flight = 0  # Reserved URLs still being fetched
+        self._deferred = []  # Queue entries skipped while max_pages was only reserved
+        self._order = itertools.count()  # Tie-breaker keeping FIFO order within a depth
+        self._out = None
         
         # Request headers
         self.headers = {
@@ -64,6 +121,26 @@ class WebCrawler:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         }
     
+    @staticmethod
+    def _resolve_output_path(
+        output_file: str, 
+        output_dir: Optional[str] = None
+    ) -> str:
+        """
+        Build the output path, creating the output directory if needed
+        
+        Args:
+            output_file (str): Name of output file
+            output_dir (str, optional): Directory to save file
+        
+        Returns:
+            str: Full output path
+        """
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            return os.path.join(output_dir, output_file)
+        return output_file
+    
     def _is_valid_url(self, url: str) -> bool:
         """
         Check if URL is valid and allowed
@@ -75,16 +152,58 @@ class WebCrawler:
             bool: Whether URL is valid and allowed
         """
         try:
-            parsed_url = urlparse(url)
+            parsed_url = _cached_urlparse(url)
+            host = parsed_url.hostname or ''  # Lowercased, without port or userinfo
             return (
-                parsed_url.scheme in ['http', 'https'] and
-                any(domain in parsed_url.netloc for domain in self.allowed_domains) and
-                url not in self.crawled_urls
+                parsed_url.scheme in ('http', 'https') and
+                (host in self._allowed_set or host.endswith(self._allowed_suffixes))
             )
         except Exception:
             return False
     
-    async def _extract_links(self, html: str, base_url: str) -> List[str]:
+    @staticmethod
+    async def _block_resources(route):
+        """
+        Abort requests for subresources and trackers that are never read
+        
+        Args:
+            route (Route): Intercepted Playwright route
+        """
+        request = route.request
+        host = urlparse(request.url).hostname or ''
+        if (
+            request.resource_type in BLOCKED_RESOURCE_TYPES or
+            host in BLOCKED_HOSTS or
+            host.endswith(BLOCKED_HOST_SUFFIXES)
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _goto(self, page, url: str):
+        """
+        Navigate to a URL without waiting on a full network idle
+        
+        Args:
+            page (Page): Playwright page
+            url (str): URL to navigate to
+        """
+        await page.goto(
+            url,
+            wait_until='domcontentloaded',
+            timeout=self.timeout * 1000
+        )
+        
+        # Give late scripts a short, bounded window to settle
+        try:
+            await page.wait_for_load_state(
+                'networkidle',
+                timeout=self.network_idle_timeout * 1000
+            )
+        except PlaywrightTimeoutError:
+            pass
+    
+    def _extract_links(self, html: str, base_url: str) -> List[str]:
         """
         Extract links from HTML
         
@@ -95,112 +214,254 @@ class WebCrawler:
         Returns:
             List of extracted links
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.set_content(html)
+        tree = HTMLParser(html)
+        
+        # Honour <base href> the way the browser resolves a.href
+        base_tag = tree.css_first('base[href]')
+        if base_tag is not None:
+            base_url = urljoin(base_url, base_tag.attributes['href'])
+        
+        # Resolve and filter links, dropping #fragments so in-page anchors
+        # do not become separate pages
+        hrefs = (node.attributes['href'] for node in tree.css('a[href]'))
+        resolved_links = {
+            urldefrag(urljoin(base_url, href.strip()))[0]
+            for href in hrefs
+            if href
+        }
+        
+        return [link for link in resolved_links if self._is_valid_url(link)]
+    
+    async def _crawl_page(
+        self,
+        page,
+        entry: tuple,
+        queue: asyncio.PriorityQueue,
+        lock: asyncio.Lock
+    ):
+        """
+        Crawl a single page and queue its links
+        
+        Args:
+            page (Page): Worker-owned Playwright page
+            entry (tuple): Queue entry of (depth, order, url)
+            queue (asyncio.PriorityQueue): Shared queue of (depth, order, url) entries
+            lock (asyncio.Lock): Lock guarding crawled URLs and data
+        """
+        depth, _, current_url = entry
+        
+        async with lock:
+            if current_url in self.crawled_urls or depth > self.depth_limit:
+                return
             
-            # Extract links
-            links = await page.evaluate('''() => {
-                return Array.from(document.querySelectorAll('a'))
-                    .map(a => a.href)
-                    .filter(href => href && href.startsWith('http'))
-            }''')
+            if len(self.crawled_urls) >= self.max_pages:
+                # A reserved fetch may still fail and free its slot, so keep
+                # the entry until every reservation has been committed
+                if self._in_flight:
+                    self._deferred.append(entry)
+                return
             
-            await browser.close()
+            # Reserve the URL so no other worker fetches it
+            self.crawled_urls.add(current_url)
+            self._in_flight += 1
+        
+        try:
+            # Navigate to page
+            await self._goto(page, current_url)
             
-            # Resolve and filter links
-            resolved_links = [
-                urljoin(base_url, link) 
-                for link in links 
-                if self._is_valid_url(urljoin(base_url, link))
-            ]
+            # Get page content
+            html_content = await page.content()
+            title = await page.title()
+            
+            # Extract content, reusing the result for pages whose text was
+            # already seen under a different URL
+            page_text = self.extractor.page_text(html_content)
+            content_hash = hashlib.blake2b(
+                page_text.encode('utf-8'), digest_size=16
+            ).hexdigest()
+            extracted_content = self._content_hashes.get(content_hash)
+            if extracted_content is None:
+                extracted_content = await self.extractor.extract(
+                    url=current_url, 
+                    html=html_content,
+                    page_text=page_text
+                )
+                
+                # Only share non-empty validated results; failure placeholders
+                # carry plain string content, and malformed LLM replies validate
+                # to an empty list, so both are retried on the next duplicate
+                if extracted_content and all(
+                    isinstance(item.get('content'), dict) for item in extracted_content
+                ):
+                    self._content_hashes[content_hash] = extracted_content
+            else:
+                self.logger.info(f"Duplicate content, skipping extraction: {current_url}")
+            
+            # Record crawled data
+            crawl_result = {
+                'url': current_url,
+                'title': title,
+                'content': extracted_content
+            }
             
-            return list(set(resolved_links))
+            new_links = self._extract_links(html_content, current_url)
+        
+        except Exception as e:
+            self.logger.error(f"Error crawling {current_url}: {e}")
+            
+            # Release the reservation and hand the slot back to the entries
+            # deferred while it was pending; the priority queue keeps BFS order
+            async with lock:
+                self.crawled_urls.discard(current_url)
+                self._in_flight -= 1
+                for deferred in self._deferred:
+                    queue.put_nowait(deferred)
+                self._deferred.clear()
+            return
+        
+        async with lock:
+            self._in_flight -= 1
+            if not self._in_flight:
+                # Every reservation is committed, so max_pages is reached for good
+                self._deferred.clear()
+            
+            if self._out:
+                # Stream the full record and keep only a summary in memory
+                self._out.write(json.dumps(crawl_result, ensure_ascii=False) + '\n')
+                self.crawled_data.append({'url': current_url, 'title': title})
+            else:
+                self.crawled_data.append(crawl_result)
+        
+        # Queue each new link once, skipping those past the depth limit
+        if depth < self.depth_limit:
+            for link in new_links:
+                if link not in self._seen:
+                    self._seen.add(link)
+                    queue.put_nowait((depth + 1, next(self._order), link))
+        
+        self.logger.info(f"Crawled page: {current_url}")
+    
+    async def _crawl_worker(
+        self,
+        context,
+        queue: asyncio.PriorityQueue,
+        lock: asyncio.Lock
+    ):
+        """
+        Crawl URLs from the shared queue on a dedicated page
+        
+        Args:
+            context (BrowserContext): Shared browser context
+            queue (asyncio.PriorityQueue): Shared queue of (depth, order, url) entries
+            lock (asyncio.Lock): Lock guarding crawled URLs and data
+        """
+        page = await context.new_page()
+        try:
+            while True:
+                entry = await queue.get()
+                try:
+                    await self._crawl_page(page, entry, queue, lock)
+                finally:
+                    queue.task_done()
+        finally:
+            await page.close()
     
     async def crawl(self) -> List[Dict[str, Union[str, Dict]]]:
         """
         Perform web crawling
         
+        Pages are fetched concurrently by ``concurrency`` workers sharing
+        a single browser. When an output file was configured, each record
+        is appended to it as a JSON line as soon as its page finishes and
+        only the URL and title are kept in ``crawled_data``. An extractor
+        created by the crawler itself is closed once the crawl ends.
+        
         Returns:
             List of crawled page data
         """
+        if self.output_path:
+            self._out = open(self.output_path, 'w', encoding='utf-8')
+        
+        try:
+            await self._run_workers()
+        finally:
+            if self._out:
+                self._out.close()
+                self._out = None
+                self.logger.info(f"Crawled data saved to {self.output_path}")
+                self.logger.info(f"Total pages crawled: {len(self.crawled_urls)}")
+            
+            if self._owns_extractor:
+                await self.extractor.aclose()
+        
+        return self.crawled_data
+    
+    async def _run_workers(self):
+        """
+        Run the crawl workers until the queue is drained
+        """
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            context = await browser.new_context()
+            if self.block_resources:
+                await context.route('**/*', self._block_resources)
             
-            # Start crawling
-            queue = [(self.start_url, 0)]
+            # Start crawling, shallowest pages first
+            queue = asyncio.PriorityQueue()
+            queue.put_nowait((0, next(self._order), self.start_url))
+            lock = asyncio.Lock()
             
-            while queue and len(self.crawled_urls) < self.max_pages:
-                current_url, depth = queue.pop(0)
-                
-                if current_url in self.crawled_urls or depth > self.depth_limit:
-                    continue
-                
-                try:
-                    # Navigate to page
-                    await page.goto(current_url, timeout=self.timeout * 1000)
-                    
-                    # Get page content
-                    html_content = await page.content()
-                    title = await page.title()
-                    
-                    # Extract content
-                    extracted_content = self.extractor.extract(
-                        url=current_url, 
-                        html=html_content
-                    )
-                    
-                    # Record crawled data
-                    crawl_result = {
-                        'url': current_url,
-                        'title': title,
-                        'content': extracted_content
-                    }
-                    
-                    self.crawled_data.append(crawl_result)
-                    self.crawled_urls.add(current_url)
-                    
-                    # Extract and queue new links
-                    new_links = await self._extract_links(html_content, current_url)
-                    queue.extend(
-                        (link, depth + 1) 
-                        for link in new_links 
-                        if link not in self.crawled_urls
-                    )
-                    
-                    self.logger.info(f"Crawled page: {current_url}")
-                
-                except Exception as e:
-                    self.logger.error(f"Error crawling {current_url}: {e}")
+            workers = [
+                asyncio.create_task(self._crawl_worker(context, queue, lock))
+                for _ in range(self.concurrency)
+            ]
             
-            await browser.close()
-        
-        return self.crawled_data
+            # Wait until every queued URL has been processed, or stop early
+            # if a worker dies, since its queued URLs would never be marked done
+            join_task = asyncio.ensure_future(queue.join())
+            try:
+                done, _ = await asyncio.wait(
+                    {join_task, *workers},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()  # Re-raise a worker failure
+            finally:
+                join_task.cancel()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(join_task, *workers, return_exceptions=True)
+                
+                await browser.close()
     
     def save_crawled_data(
         self, 
-        output_file: str = 'crawled_data.json', 
+        output_file: str = 'crawled_data.jsonl', 
         output_dir: Optional[str] = None
     ):
         """
-        Save crawled data to a JSON file
+        Save crawled data to an NDJSON file, one record per line
+        
+        Does nothing when the crawler streamed to an output file: the full
+        records are already there and ``crawled_data`` only holds summaries.
         
         Args:
             output_file (str): Name of output file
             output_dir (str, optional): Directory to save file
         """
-        # Determine full output path
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            full_path = os.path.join(output_dir, output_file)
-        else:
-            full_path = output_file
+        if self.output_path:
+            self.logger.warning(
+                f"Crawled data was already streamed to {self.output_path}; "
+                "skipping save of the URL/title summaries kept in memory"
+            )
+            return
+        
+        full_path = self._resolve_output_path(output_file, output_dir)
         
         # Save data
         with open(full_path, 'w', encoding='utf-8') as f:
-            json.dump(self.crawled_data, f, indent=2, ensure_ascii=False)
+            for record in self.crawled_data:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
         
         self.logger.info(f"Crawled data saved to {full_path}")
         self.logger.info(f"Total pages crawled: {len(self.crawled_urls)}")
@@ -1,13 +1,20 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
+
+import msgspec
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
 from ..models.extraction_schema import DocumentationExtractionDetails
 
+# Elements that carry no documentation content
+NON_CONTENT_SELECTOR = 'script, style, noscript, svg, nav, footer'
+
 class BaseExtractor(ABC):
     """
     Abstract base class for content extraction strategies
     """
     @abstractmethod
-    def extract(
+    async def extract(
         self, 
         url: str, 
         html: str, 
@@ -26,6 +33,31 @@ class BaseExtractor(ABC):
         """
         pass
 
+    async def aclose(self):
+        """
+        Release resources held by the extractor
+        """
+        pass
+
+    def page_text(self, html: str) -> str:
+        """
+        Visible text the extractor works from
+        
+        The crawler hashes this text to detect duplicate pages, so pages
+        differing only in markup, scripts or navigation share one extraction.
+        
+        Args:
+            html (str): HTML content
+        
+        Returns:
+            str: Page text without markup and boilerplate elements
+        """
+        tree = HTMLParser(html)
+        for node in tree.css(NON_CONTENT_SELECTOR):
+            node.decompose()
+        
+        return tree.text(separator=' ', strip=True)
+
     def _validate_extraction(
         self, 
         extraction_result: List[Dict[str, str]]
@@ -42,16 +74,14 @@ class BaseExtractor(ABC):
         validated_results = []
         for result in extraction_result:
             try:
-                # Attempt to validate against schema
-                parsed_data = DocumentationExtractionDetails.model_validate_json(
-                    result.get('content', '{}')
+                # Decode and validate against schema in a single pass
+                parsed_data = msgspec.json.decode(
+                    result.get('content', '{}'),
+                    type=DocumentationExtractionDetails
                 )
                 
-                # Convert to dictionary, filtering out None values
-                content_dict = {
-                    k: v for k, v in parsed_data.model_dump().items() 
-                    if v is not None
-                }
+                # Convert to dictionary; None fields are omitted by the schema
+                content_dict = msgspec.to_builtins(parsed_data)
                 
                 # If content is empty, skip
                 if not content_dict:
@@ -61,7 +91,7 @@ class BaseExtractor(ABC):
                     'content': content_dict
                 })
             
-            except Exception as parse_err:
+            except msgspec.DecodeError as parse_err:
                 # Log parsing errors or handle as needed
                 print(f"Validation error: {parse_err}")
         
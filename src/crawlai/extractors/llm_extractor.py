@@ -1,8 +1,9 @@
 import os
-import time
 import json
+import asyncio
 import logging
-import requests
+import httpx
+import orjson
 from typing import List, Dict, Optional
 
 from ..models.extraction_schema import DocumentationExtractionDetails
@@ -20,7 +21,8 @@ class LLMExtractor(BaseExtractor):
         base_url: str = 'https://api.groq.com/openai/v1',
         max_retries: int = 5,
         timeout: int = 30,
-        backoff_factor: float = 1.5
+        backoff_factor: float = 1.5,
+        max_in_flight: int = 4
     ):
         """
         Initialize LLM extractor
@@ -32,6 +34,7 @@ class LLMExtractor(BaseExtractor):
             max_retries (int): Number of retry attempts
             timeout (int): Request timeout
             backoff_factor (float): Exponential backoff multiplier
+            max_in_flight (int): Maximum concurrent API requests
         """
         self.logger = logging.getLogger(__name__)
         
@@ -45,29 +48,60 @@ class LLMExtractor(BaseExtractor):
         self.max_retries = max_retries
         self.timeout = timeout
         self.backoff_factor = backoff_factor
+        self.max_in_flight = max_in_flight
         
         # Initialize rate limiter
         self.rate_limiter = GroqRateLimiter()
+        self._semaphore = None  # Created lazily inside the running event loop
+        
+        # Pooled HTTP/2 client reused across extractions so TCP and TLS
+        # connections are kept alive between requests
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            timeout=self.timeout,
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            },
+            limits=httpx.Limits(keepalive_expiry=60)
+        )
+    
+    async def aclose(self):
+        """
+        Close pooled HTTP connections
+        """
+        await self._client.aclose()
     
-    def _compact_html_extraction(self, url: str, html: str) -> str:
+    def page_text(self, html: str) -> str:
+        """
+        Visible page text, truncated to what the model is sent
+        
+        Args:
+            html (str): HTML content
+        
+        Returns:
+            str: Page text without markup and boilerplate elements
+        """
+        # Truncate text to prevent overwhelming the model
+        return super().page_text(html)[:4000]
+    
+    def _compact_html_extraction(self, url: str, page_text: str) -> str:
         """
         Create a compact extraction prompt
         
         Args:
             url (str): Source URL
-            html (str): HTML content
+            page_text (str): Page text from page_text()
         
         Returns:
             str: Compact extraction prompt
         """
-        # Truncate HTML to prevent overwhelming the model
-        truncated_html = html[:4000]  # Reduced from 8000
-        
         # More concise prompt
         return f"""Extract key technical details from {url}:
 
-HTML:
-{truncated_html}
+PAGE TEXT:
+{page_text}
 
 INSTRUCTIONS:
 1. Provide technical content summary
@@ -83,7 +117,7 @@ INSTRUCTIONS:
 4. Minimal/empty if no details
 5. Technical, actionable info"""
     
-    def extract(
+    async def extract(
         self, 
         url: str, 
         html: str, 
@@ -95,20 +129,21 @@ INSTRUCTIONS:
         Args:
             url (str): Source URL
             html (str): HTML content
-            **kwargs: Additional arguments
+            **kwargs: Additional arguments; page_text reuses text already
+                computed by page_text()
         
         Returns:
             List of extracted content dictionaries
         """
         # Prepare extraction prompt
-        prompt = self._compact_html_extraction(url, html)
+        page_text = kwargs.get('page_text')
+        if page_text is None:
+            page_text = self.page_text(html)
+        prompt = self._compact_html_extraction(url, page_text)
         
         # Estimate token count
         estimated_tokens = len(prompt) // 4
         
-        # Wait if needed to respect rate limits
-        self.rate_limiter.wait_if_needed(token_count=estimated_tokens)
-        
         # Prepare API request payload
         payload = {
             'model': self.model,
@@ -128,32 +163,53 @@ INSTRUCTIONS:
             'top_p': 0.9
         }
         
+        # Bound concurrent API calls
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        
+        async with self._semaphore:
+            # Reserve rate limit budget up front instead of reacting to 429s
+            if not await self.rate_limiter.wait_if_needed(token_count=estimated_tokens):
+                return [{'content': 'Rate limit budget exhausted'}]
+            
+            return await self._post_with_retries(url, payload)
+    
+    async def _post_with_retries(
+        self, 
+        url: str, 
+        payload: Dict
+    ) -> List[Dict[str, str]]:
+        """
+        Send a chat completion request, retrying on failures
+        
+        Args:
+            url (str): Source URL
+            payload (Dict): Chat completion request payload
+        
+        Returns:
+            List of extracted content dictionaries
+        """
         # Retry mechanism with exponential backoff
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
-                    f'{self.base_url}/chat/completions',
-                    headers={
-                        'Authorization': f'Bearer {self.api_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json=payload,
-                    timeout=self.timeout
+                response = await self._client.post(
+                    '/chat/completions',
+                    json=payload
                 )
                 
                 # Check response
                 if response.status_code == 429:  # Rate limit error
                     wait_time = (self.backoff_factor ** attempt)
                     self.logger.warning(f"Rate limited. Waiting {wait_time:.2f}s (Attempt {attempt + 1})")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                 
                 if response.status_code != 200:
                     self.logger.error(f"Extraction error for {url}: {response.text}")
                     return [{'content': 'API request failed'}]
                 
-                # Parse response
-                result = response.json()
+                # Parse response straight from the raw bytes
+                result = orjson.loads(response.content)
                 content_text = result['choices'][0]['message']['content'].strip()
                 
                 # Validate and process extraction
@@ -163,10 +219,12 @@ INSTRUCTIONS:
                 
                 return validated_result
             
-            except requests.exceptions.RequestException as e:
+            # Non-JSON bodies from proxies or gateways and replies without
+            # choices are retried like transport errors
+            except (httpx.RequestError, orjson.JSONDecodeError, KeyError, IndexError) as e:
                 self.logger.error(f"Request attempt {attempt + 1} failed: {e}")
                 wait_time = (self.backoff_factor ** attempt)
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 
                 if attempt == self.max_retries - 1:
                     return [{'content': f'Extraction failed after {self.max_retries} attempts'}]
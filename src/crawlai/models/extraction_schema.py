@@ -1,34 +1,27 @@
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List, Dict, Any
 
-class DocumentationExtractionDetails(BaseModel):
+import msgspec
+from msgspec import Meta
+
+class DocumentationExtractionDetails(msgspec.Struct, omit_defaults=True):
     """
     Structured schema for extracting technical documentation details
+    
+    Unknown fields are ignored when decoding, and fields left as None are
+    omitted when converting back to builtins.
     """
-    section_name: Optional[str] = Field(
-        None, 
+    section_name: Optional[Annotated[str, Meta(
         description="Name or title of the documentation section"
-    )
-    description: Optional[str] = Field(
-        None, 
+    )]] = None
+    description: Optional[Annotated[str, Meta(
         description="Concise description of the section's purpose and content"
-    )
-    key_features: Optional[List[str]] = Field(
-        None, 
+    )]] = None
+    key_features: Optional[Annotated[List[str], Meta(
         description="List of key features, capabilities, or important points"
-    )
-    code_examples: Optional[List[str]] = Field(
-        None, 
+    )]] = None
+    code_examples: Optional[Annotated[List[str], Meta(
         description="Relevant code snippets or usage examples"
-    )
-    configuration_options: Optional[Dict[str, Any]] = Field(
-        None, 
+    )]] = None
+    configuration_options: Optional[Annotated[Dict[str, Any], Meta(
         description="Configuration parameters or settings"
-    )
-
-    class Config:
-        """Pydantic configuration for extra validation and serialization"""
-        extra = 'ignore'  # Ignore extra fields
-        json_encoders = {
-            # Custom JSON encoding if needed
-        }
+    )]] = None
@@ -1,8 +1,130 @@
 import time
+import asyncio
 import logging
-from collections import deque
-from threading import Lock
-from typing import Optional
+from typing import Optional, Tuple
+
+# Window widths in nanoseconds
+MINUTE_NS = 60_000_000_000
+DAY_NS = 86_400_000_000_000
+
+# Minimum gap between throttling warnings
+LOG_INTERVAL_NS = 1_000_000_000
+
+class _SlidingWindow:
+    """
+    Request and token usage over a sliding window, aggregated in slots
+    
+    The window is split into ``slots`` slots plus one for the slot in
+    progress. An admission is counted until its whole slot has left the
+    window, so usage within any span of the window width never exceeds
+    the limits; capacity is freed at most one slot late.
+    """
+    __slots__ = (
+        'request_limit', 'token_limit', 'slot_ns', 'size',
+        'requests', 'tokens', 'request_total', 'token_total', 'current'
+    )
+    
+    def __init__(
+        self, 
+        request_limit: int, 
+        token_limit: int, 
+        window_ns: int, 
+        slots: int, 
+        now_ns: int
+    ):
+        """
+        Initialize an empty window
+        
+        Args:
+            request_limit (int): Requests allowed per window
+            token_limit (int): Tokens allowed per window
+            window_ns (int): Window width in nanoseconds
+            slots (int): Number of slots the window is split into
+            now_ns (int): Current monotonic timestamp in nanoseconds
+        """
+        self.request_limit = request_limit
+        self.token_limit = token_limit
+        self.slot_ns = window_ns // slots
+        self.size = slots + 1
+        
+        # Per-slot usage, indexed by slot number modulo size
+        self.requests = [0] * self.size
+        self.tokens = [0] * self.size
+        self.request_total = 0
+        self.token_total = 0
+        self.current = now_ns // self.slot_ns
+    
+    def advance(self, now_ns: int):
+        """
+        Expire slots that have left the window since the last call
+        
+        Args:
+            now_ns (int): Current monotonic timestamp in nanoseconds
+        """
+        slot = now_ns // self.slot_ns
+        if slot - self.current >= self.size:
+            # Idle for a whole window: everything has expired
+            self.requests = [0] * self.size
+            self.tokens = [0] * self.size
+            self.request_total = 0
+            self.token_total = 0
+        else:
+            for expired in range(self.current + 1, slot + 1):
+                index = expired % self.size
+                self.request_total -= self.requests[index]
+                self.token_total -= self.tokens[index]
+                self.requests[index] = 0
+                self.tokens[index] = 0
+        self.current = slot
+    
+    def wait_ns(
+        self, 
+        now_ns: int, 
+        request_count: int, 
+        token_count: int
+    ) -> int:
+        """
+        Nanoseconds until a request fits in the window
+        
+        Args:
+            now_ns (int): Current monotonic timestamp in nanoseconds
+            request_count (int): Number of requests
+            token_count (int): Number of tokens in the request
+        
+        Returns:
+            int: Nanoseconds to wait, 0 if the request fits now
+        """
+        # A cost larger than the limit is admitted once the window is
+        # empty, instead of waiting forever
+        request_excess = self.request_total + min(request_count, self.request_limit) - self.request_limit
+        token_excess = self.token_total + min(token_count, self.token_limit) - self.token_limit
+        if request_excess <= 0 and token_excess <= 0:
+            return 0
+        
+        # Walk slots oldest first until enough usage has expired; slot k
+        # expires once slot k + size starts
+        for slot in range(self.current - self.size + 1, self.current + 1):
+            index = slot % self.size
+            request_excess -= self.requests[index]
+            token_excess -= self.tokens[index]
+            if request_excess <= 0 and token_excess <= 0:
+                return (slot + self.size) * self.slot_ns - now_ns
+        
+        return 0
+    
+    def record(self, request_count: int, token_count: int):
+        """
+        Count an admitted request in the current slot
+        
+        Args:
+            request_count (int): Number of requests
+            token_count (int): Number of tokens in the request
+        """
+        index = self.current % self.size
+        self.requests[index] += request_count
+        self.tokens[index] += token_count
+        self.request_total += request_count
+        self.token_total += token_count
 
 class GroqRateLimiter:
     """
@@ -13,7 +135,19 @@ class GroqRateLimiter:
     - Tokens per Minute (TPM)
     - Requests per Day (RPD)
     - Tokens per Day (TPD)
+    
+    Limits are enforced over sliding windows, as the provider does: no
+    span of 60 seconds admits more than the per-minute limits, and no span
+    of 24 hours more than the per-day limits. Usage is aggregated into 60
+    one-second slots per minute and 1440 one-minute slots per day, so state
+    is bounded regardless of traffic.
     """
+    __slots__ = (
+        'logger',
+        'rpm_limit', 'tpm_limit', 'rpd_limit', 'tpd_limit',
+        '_minute', '_day', '_last_log', 'lock'
+    )
+    
     def __init__(
         self, 
         rpm_limit: int = 300,  # Default 300 requests per minute
@@ -21,7 +155,7 @@ class GroqRateLimiter:
         rpd_limit: int = 10000,  # Default 10000 requests per day
         tpd_limit: int = 200000,  # Default 200000 tokens per day
         safety_margin: float = 0.9,  # 90% of limit to provide buffer
-        pruning_interval: int = 60  # Prune old records every 60 seconds
+        pruning_interval: int = 60  # Unused, kept for compatibility
     ):
         """
         Initialize rate limiter with configurable limits
@@ -32,7 +166,7 @@ class GroqRateLimiter:
             rpd_limit (int): Requests per day limit
             tpd_limit (int): Tokens per day limit
             safety_margin (float): Percentage of limit to use
-            pruning_interval (int): Interval for pruning old records
+            pruning_interval (int): Ignored; slots expire as the windows advance
         """
         self.logger = logging.getLogger(__name__)
         
@@ -41,36 +175,86 @@ class GroqRateLimiter:
         self.rpd_limit = int(rpd_limit * safety_margin)
         self.tpd_limit = int(tpd_limit * safety_margin)
         
-        self.requests_minute = deque()
-        self.tokens_minute = deque()
-        self.requests_day = deque()
-        self.tokens_day = deque()
+        # A zero limit could never admit anything
+        for name in ('rpm_limit', 'tpm_limit', 'rpd_limit', 'tpd_limit'):
+            if getattr(self, name) < 1:
+                raise ValueError(
+                    f"{name} must be at least 1 after the {safety_margin} safety margin"
+                )
         
-        self.lock = Lock()
-        self.last_pruned = time.time()
+        now_ns = time.monotonic_ns()
+        self._minute = _SlidingWindow(self.rpm_limit, self.tpm_limit, MINUTE_NS, 60, now_ns)
+        self._day = _SlidingWindow(self.rpd_limit, self.tpd_limit, DAY_NS, 1440, now_ns)
+        self._last_log = now_ns - LOG_INTERVAL_NS
+        
+        self.lock = None  # asyncio.Lock, created lazily inside the running event loop
     
-    def _prune_old_records(self, current_time: float):
+    def _compute_wait(
+        self, 
+        now_ns: int, 
+        token_count: int, 
+        request_count: int
+    ) -> int:
         """
-        Remove records older than 1 minute/day
+        Compute how long to wait before a request can be admitted
         
         Args:
-            current_time (float): Current timestamp
+            now_ns (int): Current monotonic timestamp in nanoseconds
+            token_count (int): Number of tokens in the request
+            request_count (int): Number of requests
+        
+        Returns:
+            int: Nanoseconds to wait, 0 if the request fits the limits
         """
-        # Prune minute-based records
-        while self.requests_minute and current_time - self.requests_minute[0] > 60:
-            self.requests_minute.popleft()
+        self._minute.advance(now_ns)
+        self._day.advance(now_ns)
         
-        while self.tokens_minute and current_time - self.tokens_minute[0][0] > 60:
-            self.tokens_minute.popleft()
+        return max(
+            self._minute.wait_ns(now_ns, request_count, token_count),
+            self._day.wait_ns(now_ns, request_count, token_count)
+        )
+    
+    def _usage(self) -> Tuple[int, int, int, int]:
+        """
+        Current window usage for log messages
         
-        # Prune day-based records
-        while self.requests_day and current_time - self.requests_day[0] > 86400:
-            self.requests_day.popleft()
+        Returns:
+            Tuple of used RPM, TPM, RPD and TPD
+        """
+        return (
+            self._minute.request_total,
+            self._minute.token_total,
+            self._day.request_total,
+            self._day.token_total
+        )
+    
+    def _should_log(self, now_ns: int) -> bool:
+        """
+        Rate limit throttling warnings to one per LOG_INTERVAL_NS
+        
+        Args:
+            now_ns (int): Current monotonic timestamp in nanoseconds
+        
+        Returns:
+            bool: Whether a warning may be emitted now
+        """
+        if now_ns - self._last_log < LOG_INTERVAL_NS:
+            return False
+        self._last_log = now_ns
+        return True
+    
+    def _record(self, token_count: int, request_count: int):
+        """
+        Count an admitted request in both windows
         
-        while self.tokens_day and current_time - self.tokens_day[0][0] > 86400:
-            self.tokens_day.popleft()
+        Args:
+            token_count (int): Number of tokens in the request
+            request_count (int): Number of requests
+        """
+        self._minute.record(request_count, token_count)
+        self._day.record(request_count, token_count)
     
-    def wait_if_needed(
+    async def wait_if_needed(
         self, 
         token_count: int = 1, 
         request_count: int = 1, 
@@ -79,57 +263,47 @@ class GroqRateLimiter:
         """
         Wait if rate limits would be exceeded
         
+        The lock is released while sleeping so other coroutines can be
+        admitted or start their own wait; limits are re-checked on waking.
+        
         Args:
             token_count (int): Number of tokens in the request
             request_count (int): Number of requests
-            timeout (int): Maximum wait time in seconds
+            timeout (int): Maximum total wait time in seconds
         
         Returns:
-            bool: Whether waiting was successful
+            bool: Whether the request was admitted; False, without waiting,
+                if the limits cannot admit it within timeout
         """
-        current_time = time.time()
+        if self.lock is None:
+            self.lock = asyncio.Lock()
         
-        with self.lock:
-            # Periodic pruning of old records
-            if current_time - self.last_pruned > 60:
-                self._prune_old_records(current_time)
-                self.last_pruned = current_time
-            
-            # Check minute-based limits
-            requests_in_minute = len(self.requests_minute)
-            tokens_in_minute = sum(t[1] for t in self.tokens_minute)
-            
-            # Check day-based limits
-            requests_in_day = len(self.requests_day)
-            tokens_in_day = sum(t[1] for t in self.tokens_day)
-            
-            # Determine if waiting is needed
-            wait_needed = (
-                requests_in_minute + request_count > self.rpm_limit or
-                tokens_in_minute + token_count > self.tpm_limit or
-                requests_in_day + request_count > self.rpd_limit or
-                tokens_in_day + token_count > self.tpd_limit
-            )
-            
-            if wait_needed:
-                # Calculate potential wait time
-                wait_time = 60 if requests_in_minute >= self.rpm_limit else 1
-                wait_time = min(wait_time, timeout)
+        deadline_ns = time.monotonic_ns() + int(timeout * 1_000_000_000)
+        
+        while True:
+            async with self.lock:
+                now_ns = time.monotonic_ns()
+                wait_ns = self._compute_wait(now_ns, token_count, request_count)
                 
-                self.logger.warning(
-                    f"Rate limit approaching. Waiting {wait_time}s. "
-                    f"Current: RPM={requests_in_minute}, TPM={tokens_in_minute}, "
-                    f"RPD={requests_in_day}, TPD={tokens_in_day}"
-                )
+                if not wait_ns:
+                    self._record(token_count, request_count)
+                    return True
                 
-                time.sleep(wait_time)
-                current_time = time.time()
-            
-            # Record the request
-            self.requests_minute.append(current_time)
-            self.requests_day.append(current_time)
+                if now_ns + wait_ns > deadline_ns:
+                    if self._should_log(now_ns):
+                        self.logger.warning(
+                            "Rate limit budget unavailable within the %ss timeout "
+                            "(next slot in %.0fs). "
+                            "Current: RPM=%d, TPM=%d, RPD=%d, TPD=%d",
+                            timeout, wait_ns / 1e9, *self._usage()
+                        )
+                    return False
+                
+                if self._should_log(now_ns):
+                    self.logger.warning(
+                        "Rate limit approaching. Waiting %.2fs. "
+                        "Current: RPM=%d, TPM=%d, RPD=%d, TPD=%d",
+                        wait_ns / 1e9, *self._usage()
+                    )
             
-            self.tokens_minute.append((current_time, token_count))
-            self.tokens_day.append((current_time, token_count))
-        
-        return True
+            await asyncio.sleep(wait_ns / 1e9)
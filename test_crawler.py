@@ -48,7 +48,7 @@ async def test_crawler():
         
         # Save results for manual inspection
         crawler.save_crawled_data(
-            output_file='test_crawl_results.json', 
+            output_file='test_crawl_results.jsonl', 
             output_dir='/home/vipin/projects/crawlai'
         )
     
@@ -0,0 +1,144 @@
+import asyncio
+import random
+import unittest
+from unittest import mock
+
+from crawlai.core import crawler
+from crawlai.core.crawler import WebCrawler
+from crawlai.extractors.base_extractor import BaseExtractor
+
+BASE = 'https://docs.example.com'
+
+class StubPage:
+    """
+    Playwright page serving HTML from a dict, with per-URL latency
+    """
+    def __init__(self, site):
+        self.site = site
+        self.url = None
+    
+    async def goto(self, url, **kwargs):
+        await asyncio.sleep(self.site.delay(url))
+        if url not in self.site.pages:
+            raise RuntimeError(f"404 {url}")
+        self.url = url
+    
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+    
+    async def content(self):
+        return self.site.pages[self.url]
+    
+    async def title(self):
+        return self.url
+    
+    async def close(self):
+        pass
+
+class StubContext:
+    def __init__(self, site):
+        self.site = site
+    
+    async def route(self, *args):
+        pass
+    
+    async def new_page(self):
+        if self.site.fail_new_page:
+            raise RuntimeError("new_page failed")
+        return StubPage(self.site)
+
+class StubBrowser:
+    def __init__(self, site):
+        self.site = site
+    
+    async def new_context(self):
+        return StubContext(self.site)
+    
+    async def close(self):
+        pass
+
+class StubSite:
+    """
+    Fake site and the async_playwright() entry point that serves it
+    """
+    def __init__(self, links, delays=None, fail_new_page=False):
+        """
+        Args:
+            links (Dict[str, List[str]]): Path -> linked paths; missing paths 404
+            delays (Dict[str, float], optional): Path -> navigation latency
+            fail_new_page (bool): Make context.new_page() raise
+        """
+        self.pages = {
+            BASE + path: ''.join(f'<a href="{link}">{link}</a>' for link in targets)
+            for path, targets in links.items()
+        }
+        self.delays = {BASE + path: delay for path, delay in (delays or {}).items()}
+        self.fail_new_page = fail_new_page
+        self.chromium = self
+    
+    def delay(self, url):
+        return self.delays.get(url, random.random() * 0.005)
+    
+    async def launch(self, **kwargs):
+        return StubBrowser(self)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        pass
+    
+    def __call__(self):
+        return self
+
+class StubExtractor(BaseExtractor):
+    async def extract(self, url, html, **kwargs):
+        return [{'content': {'description': url}}]
+
+class WebCrawlerTest(unittest.TestCase):
+    """
+    Crawl scheduling against a stubbed browser
+    """
+    def _crawl(self, site, **kwargs):
+        """
+        Crawl BASE/ on the stub site
+        
+        Returns:
+            Sorted list of crawled paths
+        """
+        web_crawler = WebCrawler(BASE + '/', extractor=StubExtractor(), **kwargs)
+        with mock.patch.object(crawler, 'async_playwright', site):
+            results = asyncio.run(asyncio.wait_for(web_crawler.crawl(), 10))
+        return sorted(result['url'][len(BASE):] for result in results)
+    
+    def test_failed_fetches_free_their_page_slots(self):
+        # Slots reserved by the two 404s must go to the remaining links
+        links = {'/': ['/x404', '/y404', '/b', '/c'], '/b': [], '/c': []}
+        for seed in range(30):
+            random.seed(seed)
+            self.assertEqual(self._crawl(StubSite(links), max_pages=3), ['/', '/b', '/c'])
+    
+    def test_freed_slots_go_to_the_shallowest_url(self):
+        # /b finishes and queues /d while the slow 404 still holds a slot;
+        # when it fails, the slot must go to /c at depth 1, not to /d at
+        # depth 2, and must not be lost
+        links = {'/': ['/x404', '/b', '/c'], '/b': ['/d'], '/c': [], '/d': []}
+        delays = {'/x404': 0.05, '/b': 0, '/c': 0, '/d': 0}
+        for concurrency in (1, 2, 8):
+            site = StubSite(links, delays)
+            self.assertEqual(
+                self._crawl(site, max_pages=3, concurrency=concurrency),
+                ['/', '/b', '/c']
+            )
+    
+    def test_in_page_anchors_are_not_crawled_again(self):
+        links = {'/': ['#intro', '/#usage', '/b#top'], '/b': ['/#intro']}
+        self.assertEqual(self._crawl(StubSite(links)), ['/', '/b'])
+    
+    def test_worker_failure_is_raised_instead_of_hanging(self):
+        site = StubSite({'/': []}, fail_new_page=True)
+        with self.assertRaisesRegex(RuntimeError, 'new_page failed'):
+            self._crawl(site)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import bisect
+import types
+import unittest
+from unittest import mock
+
+from crawlai.utils import rate_limiter
+from crawlai.utils.rate_limiter import GroqRateLimiter, MINUTE_NS, DAY_NS
+
+class FakeClock:
+    """
+    Monotonic nanosecond clock that only moves when slept on
+    """
+    def __init__(self, start_ns: int):
+        self.now_ns = start_ns
+    
+    def monotonic_ns(self) -> int:
+        return self.now_ns
+    
+    async def sleep(self, delay: float):
+        self.now_ns += max(1, int(delay * 1_000_000_000))
+
+class GroqRateLimiterTest(unittest.TestCase):
+    """
+    Worst-case admissions of a client that calls again as soon as it is admitted
+    """
+    def setUp(self):
+        # Start mid-slot so slot boundaries do not line up with the first call
+        self.clock = FakeClock(1_234_567_890_123_456)
+        patches = [
+            mock.patch.object(rate_limiter, 'time', self.clock),
+            mock.patch.object(
+                rate_limiter,
+                'asyncio',
+                types.SimpleNamespace(Lock=asyncio.Lock, sleep=self.clock.sleep)
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+    def _admit_greedily(self, limiter, until_ns, token_count=1):
+        """
+        Admit requests back to back until the fake clock passes until_ns
+        
+        Returns:
+            List of (admission time, token count) pairs
+        """
+        async def run():
+            admissions = []
+            while self.clock.now_ns < until_ns:
+                admitted = await limiter.wait_if_needed(
+                    token_count=token_count, timeout=2 * 86400
+                )
+                self.assertTrue(admitted)
+                admissions.append((self.clock.now_ns, token_count))
+                self.clock.now_ns += 1_000_000  # 1ms between calls
+            return admissions
+        
+        return asyncio.run(run())
+    
+    def _max_in_window(self, admissions, window_ns):
+        """
+        Largest request and token totals admitted within any span of window_ns
+        """
+        times = [t for t, _ in admissions]
+        tokens = [0]
+        for _, count in admissions:
+            tokens.append(tokens[-1] + count)
+        
+        max_requests = max_tokens = 0
+        for start, start_ns in enumerate(times):
+            end = bisect.bisect_left(times, start_ns + window_ns)
+            max_requests = max(max_requests, end - start)
+            max_tokens = max(max_tokens, tokens[end] - tokens[start])
+        return max_requests, max_tokens
+    
+    def test_requests_per_minute_hold_over_any_window(self):
+        limiter = GroqRateLimiter(rpm_limit=300)
+        start_ns = self.clock.now_ns
+        admissions = self._admit_greedily(limiter, start_ns + 5 * MINUTE_NS)
+        
+        max_requests, _ = self._max_in_window(admissions, MINUTE_NS)
+        self.assertEqual(max_requests, limiter.rpm_limit)
+    
+    def test_tokens_per_minute_hold_over_any_window(self):
+        limiter = GroqRateLimiter(tpm_limit=6000)
+        start_ns = self.clock.now_ns
+        admissions = self._admit_greedily(
+            limiter, start_ns + 5 * MINUTE_NS, token_count=250
+        )
+        
+        _, max_tokens = self._max_in_window(admissions, MINUTE_NS)
+        self.assertLessEqual(max_tokens, limiter.tpm_limit)
+        self.assertGreater(max_tokens, limiter.tpm_limit - 250)
+    
+    def test_requests_per_day_hold_over_any_window(self):
+        limiter = GroqRateLimiter(rpm_limit=100000, tpm_limit=10 ** 9, rpd_limit=500)
+        start_ns = self.clock.now_ns
+        admissions = self._admit_greedily(limiter, start_ns + 3 * DAY_NS)
+        
+        max_requests, _ = self._max_in_window(admissions, DAY_NS)
+        self.assertEqual(max_requests, limiter.rpd_limit)
+    
+    def test_oversized_request_is_admitted_once_window_is_empty(self):
+        limiter = GroqRateLimiter(tpm_limit=6000)
+        
+        async def run():
+            self.assertTrue(await limiter.wait_if_needed(token_count=100))
+            start_ns = self.clock.now_ns
+            self.assertTrue(await limiter.wait_if_needed(token_count=10000))
+            return self.clock.now_ns - start_ns
+        
+        waited_ns = asyncio.run(run())
+        self.assertGreaterEqual(waited_ns, MINUTE_NS)
+        self.assertLessEqual(waited_ns, MINUTE_NS + 1_000_000_000)
+    
+    def test_request_over_timeout_is_refused_without_waiting(self):
+        limiter = GroqRateLimiter(rpm_limit=10)
+        
+        async def run():
+            for _ in range(limiter.rpm_limit):
+                self.assertTrue(await limiter.wait_if_needed())
+            start_ns = self.clock.now_ns
+            self.assertFalse(await limiter.wait_if_needed(timeout=30))
+            return self.clock.now_ns - start_ns
+        
+        self.assertEqual(asyncio.run(run()), 0)
+    
+    def test_limit_rounding_to_zero_is_rejected(self):
+        with self.assertRaises(ValueError):
+            GroqRateLimiter(rpm_limit=1)
+
+if __name__ == '__main__':
+    unittest.main()